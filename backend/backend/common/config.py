@@ -20,9 +20,9 @@ class Config(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
 
     # Analysis settings
-    MAX_CONCURRENT_JOBS: int = 3
     ANALYSIS_TIMEOUT: int = 7200  # 2 hours
 
     # Auth0 settings
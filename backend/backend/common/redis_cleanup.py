@@ -13,9 +13,9 @@ def cleanup_all_jobs():
         # Get all job keys
         job_keys = redis.list_jobs()
         
-        # Delete all job data
-        for job_id in job_keys:
-            redis.delete_job_data(job_id)
+        # Delete all job data in one batch
+        if not redis.delete_jobs_data(job_keys):
+            return 0
             
         logger.info(f"Cleaned up {len(job_keys)} jobs from Redis")
         return len(job_keys)
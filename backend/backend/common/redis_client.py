@@ -8,31 +8,115 @@ from typing import Any, Dict, Optional, List
 from uuid import UUID
 from pathlib import Path
 import redis
-from redis.exceptions import RedisError
+from redis.exceptions import RedisError, ResponseError, WatchError
 
 logger = logging.getLogger(__name__)
 
+# Encoded form of a freshly extracted use case entry; only the name and the
+# use case payload vary, so they are spliced into a fixed JSON template
+PENDING_USE_CASE_TEMPLATE = '{{"name":{name},"status":"pending","data":{data}}}'
+
+# Fields every job hash starts with; counters are stored as plain integers so
+# they stay valid JSON under HINCRBY
+NEW_JOB_DEFAULTS = {
+    "status": "pending",
+    "total_use_cases": 0,
+    "completed": 0,
+    "failed": 0,
+    "pending": 0,
+}
+
+# Stores a finished use case entry and moves the job counters in one atomic
+# step, so workers finishing at the same time never race on the counters.
+# A use case that is already finished is left as it is, so a redelivered
+# task can't count it twice. This script is the only place that sets the
+# final job status.
+# KEYS: use case hash, job hash. ARGV: use case index, encoded entry, status.
+# Returns the number of use cases still pending.
+COMPLETE_USE_CASE_SCRIPT = """
+local existing = redis.call('HGET', KEYS[1], ARGV[1])
+if existing then
+    local ok, entry = pcall(cjson.decode, existing)
+    if ok and (entry['status'] == 'completed' or entry['status'] == 'failed') then
+        return tonumber(redis.call('HGET', KEYS[2], 'pending'))
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if ARGV[3] == 'completed' then
+    redis.call('HINCRBY', KEYS[2], 'completed', 1)
+else
+    redis.call('HINCRBY', KEYS[2], 'failed', 1)
+end
+local pending = redis.call('HINCRBY', KEYS[2], 'pending', -1)
+if pending <= 0 then
+    if tonumber(redis.call('HGET', KEYS[2], 'failed')) == 0 then
+        redis.call('HSET', KEYS[2], 'status', '"completed"')
+    else
+        redis.call('HSET', KEYS[2], 'status', '"completed_with_errors"')
+    end
+end
+return pending
+"""
+
+def _encode_fields(data: Dict[str, Any]) -> Dict[str, str]:
+    """JSON-encode each value of a dict for storage as hash fields."""
+    return {field: json.dumps(value, default=str) for field, value in data.items()}
+
+
+def _encode_use_case(use_case_data: Dict[str, Any], encoded_data: Optional[str] = None) -> str:
+    """Encode a use case entry, splicing in an already encoded "data" payload."""
+    if encoded_data is None:
+        return json.dumps(use_case_data, default=str)
+    fields = json.dumps({k: v for k, v in use_case_data.items() if k != "data"}, default=str)
+    separator = "," if fields != "{}" else ""
+    return f'{fields[:-1]}{separator}"data":{encoded_data}}}'
+
+
+def _decode_fields(fields: Dict[str, str]) -> Dict[str, Any]:
+    """Decode hash fields written by _encode_fields."""
+    return {field: json.loads(value) for field, value in fields.items()}
+
+
+def _is_wrong_type(error: ResponseError) -> bool:
+    """Whether a command failed because the key holds another data type.
+    
+    Pipelines prefix the server's message with the failing command, so the
+    error code is searched for rather than matched at the start.
+    """
+    return "WRONGTYPE" in str(error)
+
 
 class RedisClient:
     """Unified Redis client for all application data storage."""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(self, redis_url: str = "redis://localhost:6379/0", max_connections: int = 50):
         """Initialize Redis client.
         
         Args:
             redis_url: Redis connection URL
+            max_connections: Upper bound on connections kept by the pool;
+                callers wait for a free connection instead of erroring
         """
         self.redis_url = redis_url
-        self.client = redis.from_url(redis_url, decode_responses=True)
+        self.pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=max_connections,
+            decode_responses=True,
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
         
         # Unified key patterns for all data types
         self.JOB_KEY = "job:{job_id}"
+        self.JOB_USE_CASES_KEY = "job_use_cases:{job_id}"
         self.USER_KEY = "user:{user_id}"
         self.PROJECT_KEY = "project:{project_id}"
         self.USER_JOBS_KEY = "user_jobs:{user_id}"
         self.USER_PROJECTS_KEY = "user_projects:{user_id}"
         self.PROJECT_JOBS_KEY = "project_jobs:{project_id}"
         
+        # Loaded once; redis-py calls it by SHA and reloads it if needed
+        self._complete_use_case = self.client.register_script(COMPLETE_USE_CASE_SCRIPT)
+        
     def ping(self) -> bool:
         """Check if Redis is available."""
         try:
@@ -42,7 +126,13 @@ class RedisClient:
             return False
     
     def store_job(self, job_id: UUID, job_data: Dict[str, Any]) -> bool:
-        """Store job data in Redis using simplified single key structure.
+        """Store job data in Redis as a hash of JSON-encoded fields.
+        
+        Only the fields in ``job_data`` are written, so counters moved by
+        workers in the meantime are left alone. Use cases are kept in a
+        separate per-job hash so per-use-case updates don't rewrite the whole
+        job document; when ``job_data`` has "use_cases" they replace the
+        job's stored use cases.
         
         Args:
             job_id: Unique job identifier
@@ -53,19 +143,73 @@ class RedisClient:
         """
         try:
             key = self.JOB_KEY.format(job_id=job_id)
-            self.client.set(
-                key,
-                json.dumps(job_data, default=str)
-            )
+            use_cases = job_data.get("use_cases")
+            fields = _encode_fields({k: v for k, v in job_data.items() if k != "use_cases"})
+            
+            pipe = self.client.pipeline()
+            if fields:
+                pipe.hset(key, mapping=fields)
+            if use_cases is not None:
+                use_cases_key = self.JOB_USE_CASES_KEY.format(job_id=job_id)
+                pipe.delete(use_cases_key)
+                if use_cases:
+                    pipe.hset(
+                        use_cases_key,
+                        mapping=_encode_fields({str(k): v for k, v in use_cases.items()})
+                    )
+            pipe.execute()
             logger.info(f"Stored job {job_id} in Redis with key {key}")
             return True
         except RedisError as e:
             logger.error(f"Failed to store job {job_id}: {e}")
             return False
     
+    def _migrate_legacy_job(self, job_id: UUID) -> bool:
+        """Rewrite a job stored as a single JSON string as a job hash.
+        
+        Jobs written before jobs became hashes are plain strings, which the
+        hash commands reject with WRONGTYPE. Any use cases embedded in the
+        string are moved into the job's use case hash.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            True if the job was migrated, False if it isn't a legacy job
+        """
+        key = self.JOB_KEY.format(job_id=job_id)
+        use_cases_key = self.JOB_USE_CASES_KEY.format(job_id=job_id)
+        
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    if pipe.type(key) != "string":
+                        pipe.unwatch()
+                        return False
+                    job_data = json.loads(pipe.get(key))
+                    use_cases = job_data.pop("use_cases", None) or {}
+                    
+                    pipe.multi()
+                    pipe.delete(key)
+                    if job_data:
+                        pipe.hset(key, mapping=_encode_fields(job_data))
+                    # Entries already in the use case hash are newer; keep them
+                    for index, use_case in use_cases.items():
+                        pipe.hsetnx(use_cases_key, str(index), json.dumps(use_case, default=str))
+                    pipe.execute()
+                    logger.info(f"Migrated legacy job {job_id} to a hash")
+                    return True
+                except WatchError:
+                    # The job changed while it was being read; try again
+                    continue
+    
     def get_job(self, job_id: UUID) -> Optional[Dict[str, Any]]:
         """Retrieve job data from Redis using simplified key.
         
+        A job still stored in the legacy string format is migrated to a
+        hash on the way.
+        
         Args:
             job_id: Unique job identifier
             
@@ -74,10 +218,20 @@ class RedisClient:
         """
         try:
             key = self.JOB_KEY.format(job_id=job_id)
-            data = self.client.get(key)
-            if data:
+            pipe = self.client.pipeline()
+            pipe.hgetall(key)
+            pipe.hgetall(self.JOB_USE_CASES_KEY.format(job_id=job_id))
+            try:
+                fields, use_cases = pipe.execute()
+            except ResponseError as e:
+                if _is_wrong_type(e) and self._migrate_legacy_job(job_id):
+                    return self.get_job(job_id)
+                raise
+            if fields:
                 logger.debug(f"Found job {job_id} in Redis")
-                return json.loads(data)
+                job_data = _decode_fields(fields)
+                job_data.setdefault("use_cases", {}).update(_decode_fields(use_cases))
+                return job_data
             else:
                 logger.warning(f"Job {job_id} not found in Redis (key: {key})")
                 return None
@@ -96,38 +250,161 @@ class RedisClient:
             field: Field name to update
             value: Field value
             
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.update_job_fields(job_id, {field: value})
+
+    def update_job_fields(self, job_id: UUID, fields: Dict[str, Any]) -> bool:
+        """Update several job fields in place without reading the job.
+        
+        A job still stored in the legacy string format is migrated to a
+        hash first.
+        
+        Args:
+            job_id: Unique job identifier
+            fields: Field names mapped to their new values
+            
         Returns:
             True if successful, False otherwise
         """
         try:
             key = self.JOB_KEY.format(job_id=job_id)
-            job_data = self.get_job(job_id)
+            now = str(datetime.now(timezone.utc))
             
-            if job_data is None:
-                logger.warning(f"Job {job_id} not found in Redis when trying to update field {field}, creating new job data")
-                job_data = {
-                    "status": "pending",
-                    "total_use_cases": 0,
-                    "completed": 0,
-                    "failed": 0,
-                    "pending": 0,
-                    "use_cases": {},
-                    "created_at": str(datetime.now(timezone.utc))
-                }
+            pipe = self.client.pipeline()
+            pipe.hset(key, mapping=_encode_fields({**fields, "updated_at": now}))
+            # Fill in the defaults of a job that was never initialized; HSETNX
+            # leaves fields that already exist untouched
+            for field, value in {**NEW_JOB_DEFAULTS, "created_at": now}.items():
+                pipe.hsetnx(key, field, json.dumps(value))
+            try:
+                created = pipe.execute()[-1]
+            except ResponseError as e:
+                if _is_wrong_type(e) and self._migrate_legacy_job(job_id):
+                    return self.update_job_fields(job_id, fields)
+                raise
             
-            job_data[field] = value
-            job_data["updated_at"] = str(datetime.now(timezone.utc))
+            if created:
+                logger.warning(f"Job {job_id} not found in Redis when trying to update fields {list(fields)}, created new job data")
+            logger.debug(f"Updated job {job_id} fields {list(fields)}")
+            return True
+        except RedisError as e:
+            logger.error(f"Failed to update job fields {job_id}.{list(fields)}: {e}")
+            return False
+
+    def get_use_case(self, job_id: UUID, use_case_index: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a single use case entry for a job.
+        
+        Args:
+            job_id: Unique job identifier
+            use_case_index: Index of the use case within the job
             
-            self.client.set(
-                key,
-                json.dumps(job_data, default=str)
-            )
-            logger.debug(f"Updated job {job_id} field {field}")
+        Returns:
+            Use case data if found, None otherwise
+        """
+        try:
+            key = self.JOB_USE_CASES_KEY.format(job_id=job_id)
+            data = self.client.hget(key, str(use_case_index))
+            return json.loads(data) if data else None
+        except (RedisError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to get use case {use_case_index} for job {job_id}: {e}")
+            return None
+
+    def start_use_case_execution(self, job_id: UUID, use_cases: List[Dict[str, Any]]) -> bool:
+        """Store freshly extracted use cases and mark the job as executing.
+        
+        The pending entries and the job counters are written in a single
+        MULTI/EXEC round trip, whatever the number of use cases.
+        
+        Args:
+            job_id: Unique job identifier
+            use_cases: Extracted use cases, stored under their list index
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.hset(self.JOB_USE_CASES_KEY.format(job_id=job_id), mapping={
+                str(i): PENDING_USE_CASE_TEMPLATE.format(
+                    name=json.dumps(uc.get("name", f"Use Case {i}")),
+                    data=json.dumps(uc, default=str)
+                )
+                for i, uc in enumerate(use_cases)
+            })
+            pipe.hset(self.JOB_KEY.format(job_id=job_id), mapping=_encode_fields({
+                "total_use_cases": len(use_cases),
+                "pending": len(use_cases),
+                "completed": 0,
+                "failed": 0,
+                "status": "executing",
+                "updated_at": str(datetime.now(timezone.utc)),
+            }))
+            pipe.execute()
             return True
         except RedisError as e:
-            logger.error(f"Failed to update job field {job_id}.{field}: {e}")
+            logger.error(f"Failed to store use cases for job {job_id}: {e}")
             return False
 
+    def update_use_case(self, job_id: UUID, use_case_index: int, use_case_data: Dict[str, Any],
+                        encoded_data: Optional[str] = None) -> bool:
+        """Store a single use case entry without touching the rest of the job.
+        
+        Args:
+            job_id: Unique job identifier
+            use_case_index: Index of the use case within the job
+            use_case_data: Use case entry to store
+            encoded_data: Already JSON-encoded use case payload, stored as the
+                entry's "data" field so it isn't re-encoded on every update
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            key = self.JOB_USE_CASES_KEY.format(job_id=job_id)
+            self.client.hset(key, str(use_case_index), _encode_use_case(use_case_data, encoded_data))
+            logger.debug(f"Updated use case {use_case_index} for job {job_id}")
+            return True
+        except RedisError as e:
+            logger.error(f"Failed to update use case {use_case_index} for job {job_id}: {e}")
+            return False
+
+    def complete_use_case(self, job_id: UUID, use_case_index: int, use_case_data: Dict[str, Any],
+                          encoded_data: Optional[str] = None) -> Optional[int]:
+        """Store a finished use case and update the job counters atomically.
+        
+        The entry is written and the completed/failed and pending counters
+        are moved by a single server-side script. The job status is set once
+        no use cases are left pending. A use case that already finished is
+        left untouched, so completing it again doesn't move the counters.
+        
+        Args:
+            job_id: Unique job identifier
+            use_case_index: Index of the use case within the job
+            use_case_data: Final use case entry; its "status" decides which
+                counter is incremented
+            encoded_data: Already JSON-encoded use case payload
+            
+        Returns:
+            Number of use cases still pending, or None on failure
+        """
+        try:
+            return self._complete_use_case(
+                keys=[
+                    self.JOB_USE_CASES_KEY.format(job_id=job_id),
+                    self.JOB_KEY.format(job_id=job_id),
+                ],
+                args=[
+                    str(use_case_index),
+                    _encode_use_case(use_case_data, encoded_data),
+                    use_case_data.get("status", "failed"),
+                ],
+            )
+        except RedisError as e:
+            logger.error(f"Failed to complete use case {use_case_index} for job {job_id}: {e}")
+            return None
+
     def initialize_job(self, job_id: UUID, repository_url: str, branch: str, 
                       include_folders: List[str], repo_path: str, data_path: str) -> bool:
         """Initialize job with all parameters.
@@ -146,11 +423,7 @@ class RedisClient:
         try:
             key = self.JOB_KEY.format(job_id=job_id)
             job_data = {
-                "status": "pending",
-                "total_use_cases": 0,
-                "completed": 0,
-                "failed": 0,
-                "pending": 0,
+                **NEW_JOB_DEFAULTS,
                 "job_params": {
                     "repository_url": repository_url,
                     "branch": branch,
@@ -160,16 +433,15 @@ class RedisClient:
                     "data_path": data_path,
                     "job_id_path": str(Path(data_path).parent)
                 },
-                "use_cases": {},
                 "containers": {},
                 "created_at": str(datetime.now(timezone.utc)),
                 "updated_at": str(datetime.now(timezone.utc))
             }
             
-            self.client.set(
-                key,
-                json.dumps(job_data, default=str)
-            )
+            pipe = self.client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=_encode_fields(job_data))
+            pipe.execute()
             return True
         except RedisError as e:
             logger.error(f"Failed to initialize job {job_id}: {e}")
@@ -184,12 +456,31 @@ class RedisClient:
         Returns:
             True if successful, False otherwise
         """
+        return self.delete_jobs_data([job_id])
+
+    def delete_jobs_data(self, job_ids: List[UUID]) -> bool:
+        """Delete data for several jobs in a single command.
+        
+        Uses UNLINK so Redis reclaims the memory of large use case hashes in
+        a background thread instead of blocking while it frees them.
+        
+        Args:
+            job_ids: Job identifiers to delete
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not job_ids:
+            return True
         try:
-            key = self.JOB_KEY.format(job_id=job_id)
-            self.client.delete(key)
+            keys = []
+            for job_id in job_ids:
+                keys.append(self.JOB_KEY.format(job_id=job_id))
+                keys.append(self.JOB_USE_CASES_KEY.format(job_id=job_id))
+            self.client.unlink(*keys)
             return True
         except RedisError as e:
-            logger.error(f"Failed to delete data for job {job_id}: {e}")
+            logger.error(f"Failed to delete data for jobs {job_ids}: {e}")
             return False
 
     def list_jobs(self, pattern: str = "*") -> List[str]:
@@ -221,17 +512,18 @@ class RedisClient:
             from datetime import timedelta
             cutoff_time = datetime.now(timezone.utc) - timedelta(days=older_than_days)
             job_ids = self.list_jobs()
-            deleted_count = 0
+            expired_job_ids = []
             
             for job_id in job_ids:
                 job_data = self.get_job(UUID(job_id))
                 if job_data and job_data.get('created_at'):
                     created_at = datetime.fromisoformat(job_data['created_at'])
                     if created_at < cutoff_time:
-                        self.delete_job_data(UUID(job_id))
-                        deleted_count += 1
+                        expired_job_ids.append(UUID(job_id))
             
-            return deleted_count
+            if not self.delete_jobs_data(expired_job_ids):
+                return 0
+            return len(expired_job_ids)
         except Exception as e:
             logger.error(f"Failed to cleanup old jobs: {e}")
             return 0
@@ -381,6 +673,9 @@ redis_client = None
 def get_redis_client(redis_url: str = None) -> RedisClient:
     """Get the global Redis client instance.
     
+    Everything in the process shares the client's connection pool, so tasks
+    reuse open connections instead of connecting on every call.
+    
     Args:
         redis_url: Optional Redis URL, defaults to config.REDIS_URL
         
@@ -389,12 +684,13 @@ def get_redis_client(redis_url: str = None) -> RedisClient:
     """
     global redis_client
     if redis_client is None:
-        if redis_url is None:
-            try:
-                from backend.common.config import config
-                redis_url = config.REDIS_URL
-            except ImportError:
-                # Fallback for testing
-                redis_url = "redis://localhost:6379/0"
-        redis_client = RedisClient(redis_url)
+        max_connections = 50
+        try:
+            from backend.common.config import config
+            redis_url = redis_url or config.REDIS_URL
+            max_connections = config.REDIS_MAX_CONNECTIONS
+        except ImportError:
+            # Fallback for testing
+            redis_url = redis_url or "redis://localhost:6379/0"
+        redis_client = RedisClient(redis_url, max_connections=max_connections)
     return redis_client
\ No newline at end of file
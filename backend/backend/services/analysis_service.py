@@ -170,24 +170,19 @@ class AnalysisService:
                     job.status = AnalysisStatus.COMPLETED
                     job.use_cases = result.get("use_cases", [])
                     
-                    # Update Redis with completed status
-                    job_data.update({
-                        "status": "completed",
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    })
-                    self.redis.store_job(job_id, job_data)
+                    # Update Redis with completed status; only the changed
+                    # fields are written so worker counters aren't overwritten
+                    self.redis.update_job_field(job_id, "status", "completed")
                 else:
                     error = str(task.result)
                     job.error = error
                     job.status = AnalysisStatus.FAILED
                     
                     # Update Redis with failed status
-                    job_data.update({
+                    self.redis.update_job_fields(job_id, {
                         "status": "failed",
                         "error": error,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
                     })
-                    self.redis.store_job(job_id, job_data)
                 
                 job.updated_at = datetime.now(timezone.utc)
 
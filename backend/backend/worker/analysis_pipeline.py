@@ -65,11 +65,12 @@ class AnalysisPipeline:
         # This should be handled by Docker runner's two-phase execution
         # Phase 1: Extract use cases
         use_cases_path = self.data_dir / "data" / "use_cases.json"
-        if use_cases_path.exists():
+        try:
             with open(use_cases_path) as f:
                 data = json.load(f)
                 return data.get("use_cases", [])
-        return []
+        except FileNotFoundError:
+            return []
     
     def _execute_use_cases(self, use_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute use cases - handled by Docker runner."""
@@ -188,8 +189,9 @@ class AnalysisPipeline:
         """Save analysis results to file."""
         results_file = self.data_dir / "results.json"
         
+        # Compact encoding, written in a single call
         with open(results_file, "w") as f:
-            json.dump(report, f, indent=2)
+            f.write(json.dumps(report, separators=(",", ":")))
         
         tasks_logger.info(f"Results saved to {results_file}")
 
@@ -39,4 +39,8 @@ celery_app.conf.update(
 celery_app.conf.task_routes = {
     "extract_use_cases": {"queue": "analysis"},
     "orchestrate_analysis": {"queue": "analysis"},
+    # Use case containers get their own queue, so a large job's fan-out
+    # doesn't hold back the clone and extraction steps of other jobs
+    "execute_single_use_case": {"queue": "execution"},
+    "finalize_job": {"queue": "analysis"},
 }
\ No newline at end of file
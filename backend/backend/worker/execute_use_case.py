@@ -1,4 +1,5 @@
 import asyncio
+import atexit
 import json
 import logging
 import os
@@ -79,6 +80,17 @@ Your task is to:
 Be thorough in your evaluation and specific in your feedback.
 """
 
+# One event loop for the whole process, reused by every use case instead of
+# creating and tearing one down per call
+_LOOP = asyncio.new_event_loop()
+atexit.register(_LOOP.close)
+
+
+def _run(coro):
+    """Run a coroutine to completion on the shared event loop."""
+    return _LOOP.run_until_complete(coro)
+
+
 async def execute_use_case(prompt: str, cwd: str):
     options = ClaudeCodeOptions(
         max_turns=300,
@@ -94,15 +106,16 @@ async def execute_use_case(prompt: str, cwd: str):
         ]
     )
 
-    messages = []
+    # Only the final message is of interest, so earlier turns aren't kept
+    last_message = None
     turn_count = 0
     async for message in query(prompt=prompt, options=options):
-        messages.append(message)
+        last_message = message
         turn_count += 1
         logger.info(f"Turn {turn_count}")
     
-    logger.info(messages[-1])
-    return messages
+    logger.info(last_message)
+    return {"last_message": last_message, "turn_count": turn_count}
 
 async def execute_use_cases(cwd: str, use_case_json_path: str, repo_path: str, include_folders: list[str]):
     """Execute all use cases from JSON file.
@@ -164,7 +177,7 @@ async def execute_use_cases(cwd: str, use_case_json_path: str, repo_path: str, i
         )
 
         try:
-            messages = await execute_use_case(prompt, cwd)
+            await execute_use_case(prompt, cwd)
             logger.info(f"Use case {i+1} execution completed")
             
             # Optional: Add a small delay between executions
@@ -219,7 +232,7 @@ async def execute_single_use_case_async(use_case: dict, repo_path: str, output_d
     logger.info(f"Output directory: {output_dir}")
     logger.info(f"Include folders: {include_folders}")
     logger.info(f"Use case index: {use_case_index}")
-    logger.info(f"Use case: {use_case}")
+    logger.debug("Use case: %s", use_case)
     logger.info(f"Repo path: {repo_path}")
     os.makedirs(output_dir, exist_ok=True)
     
@@ -251,7 +264,7 @@ async def execute_single_use_case_async(use_case: dict, repo_path: str, output_d
         cwd=output_dir,
         include_folders=include_folders_str
     )
-    logger.info(f"Prompt: {prompt}")
+    logger.debug("Prompt: %s", prompt)
     
     try:
         # Execute the use case and get generated code
@@ -271,7 +284,7 @@ async def execute_single_use_case_async(use_case: dict, repo_path: str, output_d
         
         error_file_path = os.path.join(output_dir, results_file_name)
         with open(error_file_path, "w") as f:
-            json.dump(error_results, f, indent=2, default=str)
+            f.write(json.dumps(error_results, separators=(",", ":"), default=str))
 
 if __name__ == "__main__":
     import sys
@@ -292,7 +305,7 @@ if __name__ == "__main__":
             use_case_id = int(sys.argv[4])
             print(f"Executing single use case ID: {use_case_id}")
             try:
-                asyncio.run(execute_single_use_case_by_id(
+                _run(execute_single_use_case_by_id(
                     use_case_json_path, output_dir, use_case_id, include_folders
                 ))
             except KeyboardInterrupt:
@@ -320,7 +333,7 @@ if __name__ == "__main__":
             # Execute each use case with index
             for i, use_case in enumerate(use_cases):
                 print(f"Executing use case {i}: {use_case.get('name', 'Unnamed')}")
-                asyncio.run(execute_single_use_case_async(
+                _run(execute_single_use_case_async(
                     use_case, "/workspace/repo", output_dir, include_folders, i
                 ))
                 
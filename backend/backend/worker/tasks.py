@@ -1,19 +1,25 @@
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 import json
 from datetime import datetime, timezone
 from uuid import UUID
-from celery import Task
+from celery import Task, chord
 from git import Repo
 
 from backend.worker.celery_app import celery_app
 from backend.common.config import config
-from backend.worker.docker_runner import DockerRunner
+from backend.worker.docker_runner import get_docker_runner
 from backend.worker.logger import tasks_logger
 from backend.common.redis_client import get_redis_client
 
 
+# Background work that overlaps with a task's own I/O, such as warming up
+# Docker while the repository is being cloned
+background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="task-background")
+
+
 class AnalysisTask(Task):
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """Handle task failure."""
@@ -39,13 +45,14 @@ def extract_use_cases(
     """Extract use cases from repository documentation."""
     
     redis_client = get_redis_client()
+    job_uuid = UUID(job_id)
     
     try:
-        redis_client.update_job_field(UUID(job_id), "status", "extracting_use_cases")
+        redis_client.update_job_field(job_uuid, "status", "extracting_use_cases")
         self.update_state(state="PROCESSING", meta={"status": "Running extraction in Docker"})
         
         # Run extraction in Docker
-        docker_runner = DockerRunner()
+        docker_runner = get_docker_runner()
         extraction_result = docker_runner.extract_use_cases(
             job_id=job_id,
             repo_path=repo_path,
@@ -53,19 +60,13 @@ def extract_use_cases(
             output_dir=output_dir
         )
         
-        # Read extracted use cases
-        use_cases_path = os.path.join(output_dir, "use_cases.json")
-        use_cases = []
-        if os.path.exists(use_cases_path):
-            with open(use_cases_path) as f:
-                data = json.load(f)
-                use_cases = data.get("use_cases", [])
-        
-        return use_cases
+        return extraction_result.get("use_cases", [])
         
     except Exception as e:
-        redis_client.update_job_field(UUID(job_id), "status", "extraction_failed")
-        redis_client.update_job_field(UUID(job_id), "error", str(e))
+        redis_client.update_job_fields(job_uuid, {
+            "status": "extraction_failed",
+            "error": str(e),
+        })
         raise RuntimeError(str(e))
 
 
@@ -77,37 +78,82 @@ def orchestrate_analysis(
     branch: str = "main",
     include_folders: List[str] = None,
 ) -> Dict[str, Any]:
-    """Single task that orchestrates the entire analysis workflow with Docker pool."""
+    """Single task that orchestrates the entire analysis workflow.
+    
+    Clones the repository and extracts use cases, then hands execution over
+    to one ``execute_single_use_case`` task per use case.
+    """
     if include_folders is None:
         include_folders = ["docs"]
     
     redis_client = get_redis_client()
+    job_uuid = UUID(job_id)
     
     try:
         # Initialize job directories
-        data_dir = os.path.join(config.DATA_DIR, job_id)
-        repo_dir = os.path.join(data_dir, "repo")
-        output_dir = os.path.join(data_dir, "data")
+        data_dir = Path(config.DATA_DIR) / job_id
+        repo_path = data_dir / "repo"
+        output_path = data_dir / "data"
         
-        os.makedirs(data_dir, exist_ok=True)
-        os.makedirs(repo_dir, exist_ok=True)
-        os.makedirs(output_dir, exist_ok=True)
+        # Both live under data_dir, so it is created along the way
+        repo_path.mkdir(parents=True, exist_ok=True)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Plain strings for Redis, Docker and the use case task arguments
+        repo_dir = str(repo_path)
+        output_dir = str(output_path)
         
         # Update job with paths and status
-        redis_client.update_job_field(UUID(job_id), "repo_path", repo_dir)
-        redis_client.update_job_field(UUID(job_id), "data_path", output_dir)
-        redis_client.update_job_field(UUID(job_id), "status", "cloning")
+        redis_client.update_job_fields(job_uuid, {
+            "repo_path": repo_dir,
+            "data_path": output_dir,
+            "status": "cloning",
+        })
         self.update_state(state="PROCESSING", meta={"status": "Cloning repository"})
         
-        # Clone repository
-        repo = Repo.clone_from(repository_url, repo_dir, branch=branch)
+        # Get the sandbox image ready while the clone runs
+        docker_runner = get_docker_runner()
+        prewarm = background_executor.submit(docker_runner.prewarm)
+        
+        # Clone repository (tip of the branch only; history and tags are never
+        # read). Blobs are fetched lazily, so with a sparse checkout only the
+        # files under include_folders (plus top-level files) are downloaded
+        # for extraction.
+        repo = Repo.clone_from(
+            repository_url,
+            repo_dir,
+            branch=branch,
+            depth=1,
+            single_branch=True,
+            filter="blob:none",
+            no_checkout=True,
+            multi_options=["--no-tags"],
+        )
+        sparse_folders = [folder.strip("/") for folder in include_folders]
+        sparse = all(folder not in ("", ".") for folder in sparse_folders)
+        if sparse:
+            repo.git.sparse_checkout("init", "--cone")
+            repo.git.sparse_checkout("set", *sparse_folders)
+        repo.git.checkout(branch)
+        
+        # Nothing to extract from; skip the extraction container entirely
+        if not any((repo_path / folder).is_dir() for folder in include_folders):
+            redis_client.update_job_field(job_uuid, "status", "completed")
+            return {
+                "job_id": job_id,
+                "repository": repository_url,
+                "branch": branch,
+                "use_cases": [],
+                "status": "completed",
+                "message": "No documentation folders present in repository"
+            }
         
         # Update status to extracting
-        redis_client.update_job_field(UUID(job_id), "status", "extracting")
+        redis_client.update_job_field(job_uuid, "status", "extracting")
         self.update_state(state="PROCESSING", meta={"status": "Extracting use cases"})
         
         # Run extraction
-        docker_runner = DockerRunner()
+        prewarm.result()
         extraction_result = docker_runner.extract_use_cases(
             job_id=job_id,
             repo_path=repo_dir,
@@ -115,16 +161,9 @@ def orchestrate_analysis(
             output_dir=output_dir
         )
         
-        # Read extracted use cases
-        use_cases_path = os.path.join(output_dir, "use_cases.json")
-        use_cases = []
-        if os.path.exists(use_cases_path):
-            with open(use_cases_path) as f:
-                data = json.load(f)
-                use_cases = data.get("use_cases", [])
-        
+        use_cases = extraction_result.get("use_cases", [])
         if not use_cases:
-            redis_client.update_job_field(UUID(job_id), "status", "completed")
+            redis_client.update_job_field(job_uuid, "status", "completed")
             return {
                 "job_id": job_id,
                 "repository": repository_url,
@@ -134,68 +173,144 @@ def orchestrate_analysis(
                 "message": "No use cases found in repository"
             }
         
-        # Update Redis with extracted use cases
-        job_data = redis_client.get_job(UUID(job_id))
-        if job_data:
-            job_data["use_cases"] = {str(i): {
-                "name": uc.get("name", f"Use Case {i}"),
-                "status": "pending",
-                "data": uc
-            } for i, uc in enumerate(use_cases)}
-            job_data["total_use_cases"] = len(use_cases)
-            job_data["pending"] = len(use_cases)
-            job_data["completed"] = 0
-            job_data["failed"] = 0
-            job_data["status"] = "executing"
-            redis_client.store_job(UUID(job_id), job_data)
-        
-        # Execute use cases with Docker pool
-        redis_client.update_job_field(UUID(job_id), "status", "executing")
-        self.update_state(state="PROCESSING", meta={"status": "Executing use cases with Docker pool"})
-        
-        results = docker_runner.execute_use_cases_with_pool(
-            job_id=job_id,
-            use_cases=use_cases,
-            repo_path=repo_dir,
-            output_dir=output_dir,
-            include_folders=include_folders,
-            pool_size=5,
-            redis_client=redis_client,
-            task_context=self  # Pass task context for status updates
-        )
-        
-        # Update final status
-        completed_count = sum(1 for r in results if r.get("status") == "completed")
-        failed_count = len(results) - completed_count
-        final_status = "completed" if failed_count == 0 else "completed_with_errors"
-        
-        redis_client.update_job_field(UUID(job_id), "status", final_status)
-        redis_client.update_job_field(UUID(job_id), "completed", completed_count)
-        redis_client.update_job_field(UUID(job_id), "failed", failed_count)
-        redis_client.update_job_field(UUID(job_id), "pending", 0)
-        
-        return {
-            "job_id": job_id,
-            "repository": repository_url,
-            "branch": branch,
-            "use_cases": use_cases,
-            "status": final_status,
-            "execution_method": "docker_pool",
-            "total_use_cases": len(use_cases),
-            "completed": completed_count,
-            "failed": failed_count,
-            "results": results,
-            "message": f"Completed execution of {len(use_cases)} use cases using Docker pool"
-        }
+        # The use case containers install and run the library from the same
+        # checkout, so they need the whole tree, not just include_folders
+        if sparse:
+            repo.git.sparse_checkout("disable")
         
+        # Update Redis with extracted use cases
+        redis_client.start_use_case_execution(job_uuid, use_cases)
+        self.update_state(state="PROCESSING", meta={"status": "Dispatching use cases"})
+    
     except Exception as e:
         error_info = {
             "error": str(e),
             "error_type": type(e).__name__,
             "timestamp": str(datetime.now(timezone.utc))
         }
-        redis_client.update_job_field(UUID(job_id), "status", "failed")
-        redis_client.update_job_field(UUID(job_id), "error", str(e))
-        redis_client.update_job_field(UUID(job_id), "error_details", error_info)
+        redis_client.update_job_fields(job_uuid, {
+            "status": "failed",
+            "error": str(e),
+            "error_details": error_info,
+        })
         self.update_state(state="FAILURE", meta={"error": str(e), "error_type": type(e).__name__})
         raise RuntimeError(str(e))
+    
+    # Fan each use case out as its own task so they spread across every
+    # worker, and gather them with a chord. The header is dispatched as one
+    # group over a single producer connection rather than one .delay() per
+    # use case. Replacing this task keeps the job id pointing at the final
+    # result.
+    raise self.replace(chord(
+        [
+            execute_single_use_case.s(job_id, i, use_case, repo_dir, output_dir, include_folders)
+            for i, use_case in enumerate(use_cases)
+        ],
+        finalize_job.s(job_id, repository_url, branch, use_cases),
+    ))
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="execute_single_use_case")
+def execute_single_use_case(
+    self,
+    job_id: str,
+    use_case_index: int,
+    use_case: Dict[str, Any],
+    repo_path: str,
+    output_dir: str,
+    include_folders: List[str],
+) -> Dict[str, Any]:
+    """Execute one use case in its own Docker container.
+    
+    Tasks are acknowledged late, so a task whose worker died after the use
+    case finished can be delivered again; the recorded result is returned
+    then instead of running the container a second time.
+    """
+    
+    redis_client = get_redis_client()
+    job_uuid = UUID(job_id)
+    
+    previous = redis_client.get_use_case(job_uuid, use_case_index)
+    if previous and previous.get("status") in ("completed", "failed"):
+        return {
+            "status": previous["status"],
+            "use_case_index": use_case_index,
+            "execution_time": previous.get("execution_time_seconds"),
+            "stdout": previous.get("container_logs", ""),
+            "error": previous.get("error_details", ""),
+        }
+    
+    encoded_use_case = json.dumps(use_case, default=str)
+    start_time = time.time()
+    entry = {
+        "name": use_case.get("name", f"Use Case {use_case_index}"),
+        "status": "running",
+        "start_time": start_time,
+        "start_time_iso": datetime.fromtimestamp(start_time, timezone.utc).isoformat(),
+    }
+    redis_client.update_use_case(job_uuid, use_case_index, entry, encoded_data=encoded_use_case)
+    
+    try:
+        result = get_docker_runner().execute_single_use_case(
+            job_id=job_id,
+            use_case_index=use_case_index,
+            use_case=use_case,
+            repo_path=repo_path,
+            output_dir=output_dir,
+            include_folders=include_folders,
+        ) or {"status": "failed", "error": "Docker not available"}
+    except Exception as e:
+        result = {"status": "failed", "error": str(e)}
+    
+    end_time = time.time()
+    result["use_case_index"] = use_case_index
+    result["execution_time"] = end_time - start_time
+    
+    entry.update({
+        "status": result["status"],
+        "end_time": end_time,
+        "end_time_iso": datetime.fromtimestamp(end_time, timezone.utc).isoformat(),
+        "execution_time_seconds": result["execution_time"],
+        "container_logs": result.get("stdout", ""),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    })
+    if result["status"] != "completed":
+        entry["error_details"] = result.get("error", "")
+    redis_client.complete_use_case(job_uuid, use_case_index, entry, encoded_data=encoded_use_case)
+    
+    return result
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="finalize_job")
+def finalize_job(
+    self,
+    results: List[Dict[str, Any]],
+    job_id: str,
+    repository_url: str,
+    branch: str,
+    use_cases: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Aggregate the use case results of a job into the task result.
+    
+    The job's counters and final status in Redis are owned by
+    ``complete_use_case``, which sets the status as the last use case
+    finishes, so nothing is written back here.
+    """
+    
+    completed_count = sum(1 for r in results if r.get("status") == "completed")
+    failed_count = len(results) - completed_count
+    final_status = "completed" if failed_count == 0 else "completed_with_errors"
+    
+    return {
+        "job_id": job_id,
+        "repository": repository_url,
+        "branch": branch,
+        "use_cases": use_cases,
+        "status": final_status,
+        "execution_method": "celery_chord",
+        "total_use_cases": len(use_cases),
+        "completed": completed_count,
+        "failed": failed_count,
+        "results": sorted(results, key=lambda r: r.get("use_case_index", 0)),
+        "message": f"Completed execution of {len(use_cases)} use cases across Celery workers"
+    }
@@ -67,7 +67,6 @@ def extract_use_cases(repo_path: str, output_path: str):
         repo_path: Path to the repository documentation
         output_path: Path to save use_cases.json
     """
-    import asyncio
     import os
     from pathlib import Path
     
@@ -88,20 +87,21 @@ def extract_use_cases(repo_path: str, output_path: str):
     )
     
     async def run_extraction():
-        messages = []
+        # Only the final message is of interest, so earlier turns aren't kept
+        last_message = None
         turn_count = 0
         try:
             async for message in query(prompt=prompt, options=options):
-                messages.append(message)
+                last_message = message
                 turn_count += 1
                 logger.info(f"Turn {turn_count} completed")
-                logger.info(f"Message: {message}")
+                logger.debug("Message: %s", message)
         except Exception as e:
             logger.error(f"Error in use case extraction: {e}")
             raise
         
-        logger.info(f"Extraction completed with {len(messages)} messages")
-        return messages
+        logger.info(f"Extraction completed with {turn_count} messages")
+        return {"last_message": last_message, "turn_count": turn_count}
     
     return asyncio.run(run_extraction())
 
@@ -9,7 +9,7 @@ import json
 from datetime import datetime, timezone
 
 # Redis connection
-client = redis.Redis(host='localhost', port=6379, db=0)
+client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
 
 def link_job_to_project(job_id: str, user_id: str, project_id: str):
     """
@@ -25,9 +25,10 @@ def link_job_to_project(job_id: str, user_id: str, project_id: str):
     
     # Check current job data
     job_key = f"job:{job_id}"
-    job_data = client.get(job_key)
+    job_data = client.hgetall(job_key)
     if job_data:
-        job_info = json.loads(job_data)
+        # Job fields are stored as individual JSON-encoded hash fields
+        job_info = {k: json.loads(v) for k, v in job_data.items()}
         print(f"Job status: {job_info.get('status')}")
         print(f"Job params: {job_info.get('job_params', {})}")
     else:
@@ -38,8 +39,7 @@ def link_job_to_project(job_id: str, user_id: str, project_id: str):
     project_key = f"project:{project_id}"
     project_data = client.hgetall(project_key)
     if project_data:
-        # Convert bytes to strings
-        project_info = {k.decode(): v.decode() for k, v in project_data.items()}
+        project_info = project_data
         print(f"Project name: {project_info.get('name')}")
         print(f"Project job_count: {project_info.get('job_count')}")
         print(f"Project last_analysis_at: {project_info.get('last_analysis_at')}")
@@ -51,7 +51,7 @@ def link_job_to_project(job_id: str, user_id: str, project_id: str):
     user_key = f"user:{user_id}"
     user_data = client.hgetall(user_key)
     if user_data:
-        user_info = {k.decode(): v.decode() for k, v in user_data.items()}
+        user_info = user_data
         print(f"User: {user_info.get('name', 'Unknown')}")
     else:
         print("❌ User not found!")
@@ -59,46 +59,42 @@ def link_job_to_project(job_id: str, user_id: str, project_id: str):
 
     print("\n=== LINKING JOB TO PROJECT ===")
 
-    # Update job data to include project_id and user_id
-    job_info['project_id'] = project_id
-    job_info['user_id'] = user_id
-    
-    # Update job in Redis
-    client.set(job_key, json.dumps(job_info))
-    print(f"✓ Updated job {job_id} with project_id and user_id")
-
-    # Update project data
-    project_info = {k.decode(): v.decode() for k, v in project_data.items()}
-    
-    # Increment job count
-    current_job_count = int(project_info.get('job_count', 0))
-    new_job_count = current_job_count + 1
-    
     # Update last_analysis_at
     current_time = datetime.now(timezone.utc).isoformat()
+    timestamp = datetime.now(timezone.utc).timestamp()
+    project_jobs_key = f"project_jobs:{project_id}"
+    user_jobs_key = f"user_jobs:{user_id}"
     
-    # Update project fields
-    client.hset(project_key, mapping={
-        'job_count': str(new_job_count),
+    # Send every write in a single round trip
+    pipe = client.pipeline()
+    
+    # Update job in Redis to include project_id and user_id
+    pipe.hset(job_key, mapping={
+        'project_id': json.dumps(project_id),
+        'user_id': json.dumps(user_id)
+    })
+    
+    # Update project fields; the job count is incremented server-side so
+    # concurrent links can't overwrite each other's increment
+    pipe.hincrby(project_key, 'job_count', 1)
+    pipe.hset(project_key, mapping={
         'last_analysis_at': current_time,
         'updated_at': current_time
     })
     
+    # Create project-job and user-job indexes
+    pipe.zadd(project_jobs_key, {job_id: timestamp})
+    pipe.expire(project_jobs_key, 30 * 24 * 60 * 60)  # 30 day TTL
+    pipe.zadd(user_jobs_key, {job_id: timestamp})
+    pipe.expire(user_jobs_key, 30 * 24 * 60 * 60)  # 30 day TTL
+    
+    new_job_count = pipe.execute()[1]
+    
+    print(f"✓ Updated job {job_id} with project_id and user_id")
     print(f"✓ Updated project {project_id}:")
-    print(f"  - job_count: {current_job_count} → {new_job_count}")
+    print(f"  - job_count: {new_job_count - 1} → {new_job_count}")
     print(f"  - last_analysis_at: {current_time}")
-
-    # Create project-job index
-    project_jobs_key = f"project_jobs:{project_id}"
-    timestamp = datetime.now(timezone.utc).timestamp()
-    client.zadd(project_jobs_key, {job_id: timestamp})
-    client.expire(project_jobs_key, 30 * 24 * 60 * 60)  # 30 day TTL
     print(f"✓ Added job to project jobs index: {project_jobs_key}")
-
-    # Create user-job index  
-    user_jobs_key = f"user_jobs:{user_id}"
-    client.zadd(user_jobs_key, {job_id: timestamp})
-    client.expire(user_jobs_key, 30 * 24 * 60 * 60)  # 30 day TTL
     print(f"✓ Added job to user jobs index: {user_jobs_key}")
 
     print("\n=== LINKING COMPLETE ===")
@@ -110,9 +106,9 @@ def verify_linking(job_id: str, user_id: str, project_id: str):
     
     # Check job has project_id and user_id
     job_key = f"job:{job_id}"
-    job_data = client.get(job_key)
+    job_data = client.hgetall(job_key)
     if job_data:
-        job_info = json.loads(job_data)
+        job_info = {k: json.loads(v) for k, v in job_data.items()}
         print(f"✓ Job project_id: {job_info.get('project_id')}")
         print(f"✓ Job user_id: {job_info.get('user_id')}")
     
@@ -120,18 +116,18 @@ def verify_linking(job_id: str, user_id: str, project_id: str):
     project_key = f"project:{project_id}"
     project_data = client.hgetall(project_key)
     if project_data:
-        project_info = {k.decode(): v.decode() for k, v in project_data.items()}
+        project_info = project_data
         print(f"✓ Project job_count: {project_info.get('job_count')}")
         print(f"✓ Project last_analysis_at: {project_info.get('last_analysis_at')}")
     
     # Check indexes exist
     project_jobs_key = f"project_jobs:{project_id}"
     jobs = client.zrange(project_jobs_key, 0, -1)
-    print(f"✓ Project jobs index: {[j.decode() for j in jobs]}")
+    print(f"✓ Project jobs index: {jobs}")
     
     user_jobs_key = f"user_jobs:{user_id}"
     jobs = client.zrange(user_jobs_key, 0, -1)
-    print(f"✓ User jobs index: {[j.decode() for j in jobs]}")
+    print(f"✓ User jobs index: {jobs}")
 
 if __name__ == "__main__":
     # Example usage with the provided IDs
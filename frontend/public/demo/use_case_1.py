@@ -14,8 +14,8 @@ Based on documentation from:
 import os
 import json
 from datetime import datetime
-from typing import List
-from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
 from guardrails import Guard
 
 # Success Criteria:
@@ -24,107 +24,114 @@ from guardrails import Guard
 # 3. Generate valid JSON that conforms to schema ✓
 # 4. Validate data types and constraints automatically ✓
 
+# Allowed values
+LoyaltyTier = Literal['Bronze', 'Silver', 'Gold']
+OrderStatus = Literal['Pending', 'Shipped', 'Delivered']
+
 class Product(BaseModel):
     """Pydantic model for a product in inventory."""
     product_id: str = Field(description="Unique identifier for the product")
-    product_name: str = Field(description="Name of the product")
-    price: float = Field(description="Price of the product in USD")
+    product_name: str = Field(min_length=3, max_length=50, description="Name of the product")
+    price: float = Field(ge=0.01, le=10000.0, description="Price of the product in USD")
     category: str = Field(description="Product category")
     in_stock: bool = Field(description="Whether the product is in stock")
-    stock_quantity: int = Field(description="Number of items in stock")
-    
-    @field_validator('product_name')
-    @classmethod
-    def validate_product_name(cls, v):
-        if len(v) < 3 or len(v) > 50:
-            raise ValueError('Product name must be between 3 and 50 characters')
-        return v
+    stock_quantity: int = Field(ge=0, le=10000, description="Number of items in stock")
     
-    @field_validator('price')
-    @classmethod
-    def validate_price(cls, v):
-        if not 0.01 <= v <= 10000.0:
-            raise ValueError('Price must be between $0.01 and $10,000')
-        return v
-    
-    @field_validator('stock_quantity')
-    @classmethod
-    def validate_stock_quantity(cls, v):
-        if not 0 <= v <= 10000:
-            raise ValueError('Stock quantity must be between 0 and 10,000')
-        return v
+    @model_validator(mode='after')
+    def validate_stock_consistency(self):
+        if self.in_stock != (self.stock_quantity > 0):
+            raise ValueError('in_stock must be true exactly when stock_quantity is above 0')
+        return self
 
 class Inventory(BaseModel):
     """Pydantic model for inventory data."""
-    products: List[Product] = Field(description="List of products in inventory")
+    products: List[Product] = Field(min_length=3, max_length=10, description="List of products in inventory")
     last_updated: str = Field(description="Last update timestamp")
     total_value: float = Field(description="Total inventory value")
-    
-    @field_validator('products')
-    @classmethod
-    def validate_products(cls, v):
-        if not 3 <= len(v) <= 10:
-            raise ValueError('Inventory must contain between 3 and 10 products')
-        return v
 
 class Customer(BaseModel):
     """Pydantic model for customer information."""
     customer_id: str = Field(description="Unique customer identifier")
     full_name: str = Field(description="Customer's full name")
     email: str = Field(description="Customer email address")
-    age: int = Field(description="Customer age")
-    loyalty_tier: str = Field(description="Customer loyalty tier (Bronze/Silver/Gold)")
+    age: int = Field(ge=18, le=120, description="Customer age")
+    loyalty_tier: LoyaltyTier = Field(description="Customer loyalty tier (Bronze/Silver/Gold)")
     
     @field_validator('full_name')
     @classmethod
     def validate_full_name(cls, v):
-        if len(v.split()) < 2:
+        # Splitting once is enough to know whether there is a second word
+        if len(v.split(maxsplit=1)) < 2:
             raise ValueError('Full name must contain at least two words')
         return v
-    
-    @field_validator('age')
-    @classmethod
-    def validate_age(cls, v):
-        if not 18 <= v <= 120:
-            raise ValueError('Age must be between 18 and 120')
-        return v
-    
-    @field_validator('loyalty_tier')
-    @classmethod
-    def validate_loyalty_tier(cls, v):
-        if v not in ['Bronze', 'Silver', 'Gold']:
-            raise ValueError('Loyalty tier must be Bronze, Silver, or Gold')
-        return v
 
 class Order(BaseModel):
     """Pydantic model for order data."""
     order_id: str = Field(description="Unique order identifier")
     customer: Customer = Field(description="Customer who placed the order")
     items: List[str] = Field(description="List of product IDs in the order")
-    total_amount: float = Field(description="Total order amount in USD")
+    total_amount: float = Field(ge=0.01, le=5000.0, description="Total order amount in USD")
     order_date: str = Field(description="Date the order was placed")
-    status: str = Field(description="Order status (Pending/Shipped/Delivered)")
-    
-    @field_validator('total_amount')
-    @classmethod
-    def validate_total_amount(cls, v):
-        if not 0.01 <= v <= 5000.0:
-            raise ValueError('Total amount must be between $0.01 and $5,000')
-        return v
-    
-    @field_validator('status')
-    @classmethod
-    def validate_status(cls, v):
-        if v not in ['Pending', 'Shipped', 'Delivered']:
-            raise ValueError('Status must be Pending, Shipped, or Delivered')
-        return v
+    status: OrderStatus = Field(description="Order status (Pending/Shipped/Delivered)")
+
+# Guards are built once at import and shared by every generation call
+try:
+    GUARDS = {
+        'inventory': Guard.for_pydantic(output_class=Inventory),
+        'order': Guard.for_pydantic(output_class=Order),
+    }
+except Exception as e:
+    print(f"❌ Error creating guards: {e}")
+    GUARDS = {}
+
+# Products returned by the mock inventory response; only read during validation
+INVENTORY_MOCK_PRODUCTS = (
+    {
+        "product_id": "PROD-001",
+        "product_name": "Wireless Bluetooth Headphones",
+        "price": 79.99,
+        "category": "Electronics",
+        "in_stock": True,
+        "stock_quantity": 45
+    },
+    {
+        "product_id": "PROD-002",
+        "product_name": "Organic Cotton T-Shirt",
+        "price": 24.99,
+        "category": "Clothing",
+        "in_stock": True,
+        "stock_quantity": 150
+    },
+    {
+        "product_id": "PROD-003",
+        "product_name": "Stainless Steel Water Bottle",
+        "price": 19.99,
+        "category": "Home & Kitchen",
+        "in_stock": True,
+        "stock_quantity": 75
+    },
+    {
+        "product_id": "PROD-004",
+        "product_name": "Yoga Mat Premium",
+        "price": 39.99,
+        "category": "Sports & Fitness",
+        "in_stock": True,
+        "stock_quantity": 30
+    },
+    {
+        "product_id": "PROD-005",
+        "product_name": "Coffee Maker Deluxe",
+        "price": 129.99,
+        "category": "Home & Kitchen",
+        "in_stock": False,
+        "stock_quantity": 0
+    },
+)
 
-def generate_inventory_data():
+def generate_inventory_data(timestamp=None):
     """Generate structured inventory data using Guardrails."""
     print("=== Generating Inventory Data ===")
     
-    guard = Guard.for_pydantic(output_class=Inventory)
-    
     prompt = """
     Generate a realistic inventory dataset for a small e-commerce store.
     Include 5-8 diverse products with different categories, prices, and stock levels.
@@ -135,58 +142,17 @@ def generate_inventory_data():
     try:
         # Use a mock LLM response for demonstration (in real usage, would call actual LLM)
         mock_response = {
-            "products": [
-                {
-                    "product_id": "PROD-001",
-                    "product_name": "Wireless Bluetooth Headphones",
-                    "price": 79.99,
-                    "category": "Electronics",
-                    "in_stock": True,
-                    "stock_quantity": 45
-                },
-                {
-                    "product_id": "PROD-002", 
-                    "product_name": "Organic Cotton T-Shirt",
-                    "price": 24.99,
-                    "category": "Clothing",
-                    "in_stock": True,
-                    "stock_quantity": 150
-                },
-                {
-                    "product_id": "PROD-003",
-                    "product_name": "Stainless Steel Water Bottle",
-                    "price": 19.99,
-                    "category": "Home & Kitchen",
-                    "in_stock": True,
-                    "stock_quantity": 75
-                },
-                {
-                    "product_id": "PROD-004",
-                    "product_name": "Yoga Mat Premium",
-                    "price": 39.99,
-                    "category": "Sports & Fitness",
-                    "in_stock": True,
-                    "stock_quantity": 30
-                },
-                {
-                    "product_id": "PROD-005",
-                    "product_name": "Coffee Maker Deluxe",
-                    "price": 129.99,
-                    "category": "Home & Kitchen",
-                    "in_stock": False,
-                    "stock_quantity": 0
-                }
-            ],
-            "last_updated": datetime.now().isoformat(),
+            "products": list(INVENTORY_MOCK_PRODUCTS),
+            "last_updated": timestamp or datetime.now().isoformat(),
             "total_value": 294.95
         }
         
         # Demonstrate Guard creation (even without API key)
-        guard = Guard.for_pydantic(output_class=Inventory)
+        guard = GUARDS['inventory']
         print(f"✅ Guard created successfully: {type(guard)}")
         
         # Validate the mock data structure using Pydantic
-        validated_data = Inventory(**mock_response)
+        validated_data = Inventory.model_validate(mock_response)
         print("✅ Inventory data validated successfully!")
         return validated_data.model_dump()
         
@@ -194,12 +160,10 @@ def generate_inventory_data():
         print(f"❌ Error validating inventory data: {e}")
         return None
 
-def generate_customer_order():
+def generate_customer_order(timestamp=None):
     """Generate structured customer and order data."""
     print("\n=== Generating Customer Order Data ===")
     
-    guard = Guard.for_pydantic(output_class=Order)
-    
     prompt = """
     Create a realistic customer order for an online store.
     Include customer details and order information with proper validation.
@@ -219,15 +183,15 @@ def generate_customer_order():
             },
             "items": ["PROD-001", "PROD-003"],
             "total_amount": 99.98,
-            "order_date": datetime.now().isoformat(),
+            "order_date": timestamp or datetime.now().isoformat(),
             "status": "Shipped"
         }
         
         # Demonstrate Guard creation
-        guard = Guard.for_pydantic(output_class=Order)
+        guard = GUARDS['order']
         print(f"✅ Guard created successfully: {type(guard)}")
         
-        validated_data = Order(**mock_response)
+        validated_data = Order.model_validate(mock_response)
         print("✅ Customer order data validated successfully!")
         return validated_data.model_dump()
         
@@ -272,14 +236,17 @@ def main():
     print("🚀 Structured Data Generation with Guardrails")
     print("=" * 50)
     
+    # Both mock datasets share one generation timestamp
+    timestamp = datetime.now().isoformat()
+    
     # Test 1: Generate inventory data
-    inventory_data = generate_inventory_data()
+    inventory_data = generate_inventory_data(timestamp)
     if inventory_data:
         print("📦 Generated Inventory Data:")
         print(json.dumps(inventory_data, indent=2))
     
     # Test 2: Generate customer order data
-    order_data = generate_customer_order()
+    order_data = generate_customer_order(timestamp)
     if order_data:
         print("\n🛒 Generated Customer Order Data:")
         print(json.dumps(order_data, indent=2))
@@ -302,8 +269,9 @@ def main():
         "validation_demo": "Completed validation failure demonstrations"
     }
     
+    # Written compactly; the file is read back as JSON, not by people
     with open('/workspace/data/use_case_results_1.json', 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+        json.dump(results, f, separators=(',', ':'), default=str)
     
     print("\n💾 Results saved to use_case_results_1.json")
 
@@ -11,8 +11,13 @@ Based on documentation from:
 - /workspace/repo/docs/how_to_guides/custom_validator.ipynb
 """
 
+import asyncio
 import os
-from typing import Dict, Any, List
+import re
+import sys
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 import guardrails as gd
 from guardrails.validator_base import Validator, register_validator, ValidationResult, PassResult, FailResult
@@ -20,6 +25,25 @@ from profanity_check import predict
 import litellm
 
 
+# Words the advanced pipeline rejects outright, matched anywhere in the
+# lowercased text in a single pass
+PROFANE_WORDS = ("kill", "hate", "die", "stupid")
+PROFANE_WORDS_RE = re.compile("|".join(map(re.escape, PROFANE_WORDS)))
+
+
+# Default scikit-learn token pattern used by the profanity model's
+# vectorizer; text without a match has no words to classify
+WORD_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+@lru_cache(maxsize=4096)
+def is_profane(text: str) -> bool:
+    """Classify text with the profanity model, remembering each answer."""
+    if not WORD_TOKEN_RE.search(text):
+        return False
+    return predict([text])[0] == 1
+
+
 @register_validator(name="is-profanity-free", data_type="string")
 class IsProfanityFree(Validator):
     """Custom validator that checks if text contains profanity."""
@@ -33,8 +57,7 @@ class IsProfanityFree(Validator):
             )
         
         # Use profanity_check to predict if text contains profanity
-        prediction = predict([value])
-        if prediction[0] == 1:
+        if is_profane(value):
             return FailResult(
                 error_message=f"Value contains profanity",
                 fix_value="",
@@ -42,6 +65,17 @@ class IsProfanityFree(Validator):
         return PassResult()
 
 
+@dataclass(slots=True)
+class TranslationOutcome:
+    """Outcome of translating one text through the pipeline."""
+    success: bool
+    original_text: str
+    translated_text: str
+    validation_passed: bool
+    raw_llm_output: Optional[str]
+    error: Optional[str]
+
+
 class TranslationResult(BaseModel):
     """Pydantic model for translation results."""
     translated_statement: str = Field(
@@ -50,6 +84,12 @@ class TranslationResult(BaseModel):
     )
 
 
+@lru_cache(maxsize=None)
+def _guard_for(guard_class, output_class):
+    """Build a guard for a Pydantic model once and share it between pipelines."""
+    return guard_class.for_pydantic(output_class=output_class)
+
+
 class SafeTranslationPipeline:
     """Safe translation pipeline with profanity checking."""
     
@@ -64,19 +104,91 @@ class SafeTranslationPipeline:
         self.target_language = target_language
         
         # Create guard with profanity checking
-        self.guard = gd.Guard.for_pydantic(output_class=TranslationResult)
+        self.guard = _guard_for(gd.Guard, TranslationResult)
+        self.async_guard = _guard_for(gd.AsyncGuard, TranslationResult)
         
-        # Translation prompt template
-        self.translation_prompt = """
-        Translate the following text from {source_language} to {target_language}.
-        Ensure the translation is accurate and professional.
+        # Successful translations by (model, source, target, trimmed text),
+        # so repeated texts don't go back to the LLM
+        self._cache: Dict[Tuple[str, str, str, str], TranslationOutcome] = {}
         
-        Text to translate: {text_to_translate}
+        # Translation instructions. Everything except the text lives in the
+        # system message, which is identical on every call, so providers
+        # with prompt caching can reuse the processed prefix
+        self.translation_prompt = (
+            "You are a professional translator.\n"
+            f"Translate the text in the user message from {source_language} to {target_language}.\n"
+            "Ensure the translation is accurate and professional.\n"
+            "Only return the translated text, nothing else."
+        )
+        self._system_message = {"role": "system", "content": self.translation_prompt}
+        # Anthropic only caches content explicitly marked as cacheable
+        self._cached_system_message = {
+            "role": "system",
+            "content": [{
+                "type": "text",
+                "text": self.translation_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }],
+        }
+    
+    def _messages(self, text: str, model: str) -> List[Dict[str, Any]]:
+        """Build the chat messages for translating one text."""
+        if model.startswith(("anthropic/", "claude")):
+            system_message = self._cached_system_message
+        else:
+            system_message = self._system_message
+        # Copied so nothing downstream can alter the shared message
+        return [dict(system_message), {"role": "user", "content": text}]
+    
+    def _cache_key(self, text: str, model: str) -> Tuple[str, str, str, str]:
+        """Key identifying a translation in the response cache.
+        
+        Only leading and trailing whitespace is trimmed; spacing and line
+        breaks inside the text are part of what the translation preserves.
+        """
+        return (model, self.source_language, self.target_language, text.strip())
+    
+    def _cached_translation(self, key: Tuple[str, str, str, str], text: str) -> Optional[TranslationOutcome]:
+        """Return a copy of a cached translation outcome for text, if there is one."""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        return replace(cached, original_text=text)
+    
+    def _remember_translation(self, key: Tuple[str, str, str, str], outcome: TranslationOutcome) -> None:
+        """Cache a copy of a translation outcome if it passed validation.
         
-        Only return the translated text, nothing else.
+        Failed validations and guard errors aren't cached, so the next
+        request for the same text tries again.
         """
+        if outcome.validation_passed and outcome.error is None:
+            self._cache[key] = replace(outcome)
+    
+    @staticmethod
+    def _translation_result(text: str, result) -> TranslationOutcome:
+        """Turn a guard outcome into a TranslationOutcome."""
+        return TranslationOutcome(
+            success=True,
+            original_text=text,
+            translated_text=result.validated_output.get("translated_statement", "") if result.validation_passed else "",
+            validation_passed=result.validation_passed,
+            raw_llm_output=result.raw_llm_output,
+            error=result.error.message if result.error else None
+        )
+    
+    @staticmethod
+    def _translation_error(text: str, error: Exception) -> TranslationOutcome:
+        """TranslationOutcome for a call that raised."""
+        return TranslationOutcome(
+            success=False,
+            original_text=text,
+            translated_text="",
+            validation_passed=False,
+            raw_llm_output=None,
+            error=str(error)
+        )
     
-    def translate_safely(self, text: str, model: str = "gpt-3.5-turbo") -> Dict[str, Any]:
+    def translate_safely(self, text: str, model: str = "gpt-3.5-turbo") -> TranslationOutcome:
         """Translate text safely with profanity checking.
         
         Args:
@@ -84,61 +196,84 @@ class SafeTranslationPipeline:
             model: LLM model to use for translation
             
         Returns:
-            Dictionary with translation results and safety check
+            TranslationOutcome with the translation and safety check
         """
-        prompt = self.translation_prompt.format(
-            source_language=self.source_language,
-            target_language=self.target_language,
-            text_to_translate=text
-        )
+        key = self._cache_key(text, model)
+        cached = self._cached_translation(key, text)
+        if cached is not None:
+            return cached
         
         try:
             # Use Guardrails to wrap the LLM call
             result = self.guard(
                 litellm.completion,
                 model=model,
-                messages=[
-                    {"role": "system", "content": "You are a professional translator."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(text, model),
                 max_tokens=2048,
                 temperature=0.1,
             )
-            
-            return {
-                "success": True,
-                "original_text": text,
-                "translated_text": result.validated_output.get("translated_statement", "") if result.validation_passed else "",
-                "validation_passed": result.validation_passed,
-                "raw_llm_output": result.raw_llm_output,
-                "error": result.error.message if result.error else None
-            }
-            
         except Exception as e:
-            return {
-                "success": False,
-                "original_text": text,
-                "translated_text": "",
-                "validation_passed": False,
-                "raw_llm_output": None,
-                "error": str(e)
-            }
+            return self._translation_error(text, e)
+        
+        outcome = self._translation_result(text, result)
+        self._remember_translation(key, outcome)
+        return outcome
     
-    def batch_translate_safely(self, texts: List[str], model: str = "gpt-3.5-turbo") -> List[Dict[str, Any]]:
+    async def _translate_safely_async(self, text: str, model: str) -> TranslationOutcome:
+        """Async counterpart of translate_safely used for batches."""
+        key = self._cache_key(text, model)
+        cached = self._cached_translation(key, text)
+        if cached is not None:
+            return cached
+        
+        try:
+            result = await self.async_guard(
+                litellm.acompletion,
+                model=model,
+                messages=self._messages(text, model),
+                max_tokens=2048,
+                temperature=0.1,
+            )
+        except Exception as e:
+            return self._translation_error(text, e)
+        
+        outcome = self._translation_result(text, result)
+        self._remember_translation(key, outcome)
+        return outcome
+    
+    async def _batch_translate_async(self, texts: List[str], model: str, max_concurrency: int) -> List[TranslationOutcome]:
+        """Run the translations concurrently, at most max_concurrency at a time."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded(text: str) -> TranslationOutcome:
+            async with semaphore:
+                return await self._translate_safely_async(text, model)
+        
+        # Each distinct text is translated once, however often it repeats
+        keys = [self._cache_key(text, model) for text in texts]
+        unique_texts = {}
+        for key, text in zip(keys, texts):
+            unique_texts.setdefault(key, text)
+        outcomes = await asyncio.gather(*(bounded(text) for text in unique_texts.values()))
+        by_key = dict(zip(unique_texts, outcomes))
+        return [replace(by_key[key], original_text=text) for key, text in zip(keys, texts)]
+    
+    def batch_translate_safely(self, texts: List[str], model: str = "gpt-3.5-turbo",
+                               max_concurrency: int = 16) -> List[TranslationOutcome]:
         """Translate multiple texts safely with profanity checking.
         
+        The LLM calls are issued concurrently, so a batch takes about as
+        long as its slowest translation rather than the sum of all of them.
+        
         Args:
             texts: List of texts to translate
             model: LLM model to use for translation
+            max_concurrency: Maximum number of translations in flight at once
             
         Returns:
-            List of dictionaries with translation results
+            List of TranslationOutcome objects, in input order
         """
-        results = []
-        for text in texts:
-            result = self.translate_safely(text, model)
-            results.append(result)
-        return results
+        return asyncio.run(self._batch_translate_async(texts, model, max_concurrency))
     
     def create_custom_validator(self, validator_name: str, validation_function) -> Validator:
         """Create a custom validator for specialized profanity checking.
@@ -192,22 +327,24 @@ def demo_safe_translation():
     
     print("=== Safe Translation with Profanity Checking ===\n")
     
-    results = []
-    for text in test_cases:
-        print(f"Original: {text}")
-        result = pipeline.translate_safely(text, model="gpt-4o-mini")
+    # All test cases are translated concurrently, then reported in order
+    # with a single write
+    results = pipeline.batch_translate_safely(test_cases, model="gpt-4o-mini")
+    lines = []
+    for result in results:
+        lines.append(f"Original: {result.original_text}")
         
-        if result["success"]:
-            print(f"Translated: {result['translated_text']}")
-            print(f"Safe: {result['validation_passed']}")
-            if not result["validation_passed"]:
-                print(f"Blocked due to: {result.get('error', 'Profanity detected')}")
+        if result.success:
+            lines.append(f"Translated: {result.translated_text}")
+            lines.append(f"Safe: {result.validation_passed}")
+            if not result.validation_passed:
+                lines.append(f"Blocked due to: {result.error or 'Profanity detected'}")
         else:
-            print(f"Error: {result['error']}")
+            lines.append(f"Error: {result.error}")
         
-        print("-" * 50)
-        results.append(result)
+        lines.append("-" * 50)
     
+    sys.stdout.write("\n".join(lines) + "\n")
     return results
 
 
@@ -217,16 +354,13 @@ def create_advanced_pipeline():
     def custom_profanity_check(text: str) -> tuple:
         """Custom profanity checking function."""
         # Basic profanity detection
-        profane_words = ["kill", "hate", "die", "stupid"]
-        
-        text_lower = text.lower()
-        for word in profane_words:
-            if word in text_lower:
-                return False, f"Contains profane word: {word}"
+        match = PROFANE_WORDS_RE.search(text.lower())
+        if match:
+            return False, f"Contains profane word: {match.group()}"
         
-        # Also use the ML-based profanity checker
-        prediction = predict([text])
-        if prediction[0] == 1:
+        # Also use the ML-based profanity checker; shares its cached
+        # predictions with IsProfanityFree
+        if is_profane(text):
             return False, "ML profanity detection triggered"
         
         return True, "Clean"
@@ -257,7 +391,7 @@ if __name__ == "__main__":
             json.dump({
                 "execution_status": "success",
                 "execution_results": "Demo completed with test cases",
-                "test_results": results,
+                "test_results": [asdict(result) for result in results],
                 "documentation_sources_used": [
                     "/workspace/repo/docs/examples/translation_to_specific_language.ipynb",
                     "/workspace/repo/docs/examples/translation_with_quality_check.ipynb",
@@ -290,7 +424,7 @@ if __name__ == "__main__":
                     "Translation accuracy vs. safety trade-offs",
                     "Handling cultural context in profanity detection"
                 ]
-            }, f, indent=2)
+            }, f, separators=(',', ':'))
         
         print(f"\nResults saved to use_case_results_10.json")
         
@@ -304,4 +438,4 @@ if __name__ == "__main__":
                 "execution_status": "failure",
                 "execution_results": str(e),
                 "error": str(e)
-            }, f, indent=2)
\ No newline at end of file
+            }, f, separators=(',', ':'))
\ No newline at end of file
@@ -10,52 +10,86 @@ including profanity filtering and toxic language detection.
 import os
 import sys
 import logging
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 import re
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximal runs of word characters; a profanity word matches as a whole word
+# exactly when it is one of these tokens
+WORD_RE = re.compile(r'\w+')
+
+PROFANITY_WORDS = frozenset({
+    'damn', 'hell', 'shit', 'fuck', 'ass', 'bitch', 'bastard', 
+    'crap', 'piss', 'dick', 'cock', 'pussy', 'tits'
+})
+
+# The toxic checks compiled into a single case-insensitive pattern, so a
+# text is scanned once instead of once per pattern. Each check is a named
+# group, and match.lastgroup tells which one matched.
+TOXIC_PATTERNS = {
+    'insult': r'\b(stupid|idiot|moron|retard|pathetic|worthless|useless)\b',
+    'hate': r'\b(hate|despise|loathe)\b.*\b(you|your|yourself)\b',
+    'dismissal': r'\b(shut up|fuck off|piss off)\b',
+}
+TOXIC_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOXIC_PATTERNS.items()),
+    re.IGNORECASE
+)
+
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful, respectful, and honest assistant. "
+               "Always provide safe and appropriate responses. "
+               "Avoid using profanity, toxic language, or inappropriate content. "
+               "If asked about harmful topics, respond with: "
+               "I cannot provide information on that topic."
+}
+
+# (text, expected_valid, description) cases run by test_content_moderation
+MODERATION_TEST_CASES = (
+    ("Hello world", True, "Should pass all validations"),
+    ("This is a damn test", False, "Should fail profanity check"),
+    ("You are so stupid and pathetic", False, "Should fail toxic language check"),
+    ("I hate this stupid thing", False, "Should fail both checks"),
+    ("Have a nice day!", True, "Should pass all validations"),
+    ("Please help me with this problem", True, "Should pass all validations"),
+)
+
 class MockContentValidator:
     """Mock validator for demonstration purposes."""
     
+    __slots__ = ('validator_type', 'threshold', 'profanity_words')
+    
     def __init__(self, validator_type: str, threshold: float = 0.5):
         self.validator_type = validator_type
         self.threshold = threshold
-        self.profanity_words = {
-            'damn', 'hell', 'shit', 'fuck', 'ass', 'bitch', 'bastard', 
-            'crap', 'piss', 'dick', 'cock', 'pussy', 'tits'
-        }
+        self.profanity_words = PROFANITY_WORDS
         
-    def validate(self, text: str) -> bool:
-        """Validate text content."""
-        text_lower = text.lower()
+    def validate(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """Validate text content.
         
+        ``text_lower`` may carry an already lowercased copy of ``text`` so
+        several validators don't each make their own.
+        """
         if self.validator_type == "profanity":
-            # Check for profanity words, but be more precise
-            words = text_lower.split()
-            # Check if any profanity word appears as a standalone word
-            for profanity in self.profanity_words:
-                if profanity in text_lower:
-                    # Check if it's a whole word match
-                    if re.search(r'\b' + re.escape(profanity) + r'\b', text_lower):
-                        return False
-            return True
+            if text_lower is None:
+                text_lower = text.lower()
+            # Any profanity word appearing as a standalone word fails
+            return self.profanity_words.isdisjoint(WORD_RE.findall(text_lower))
         
         elif self.validator_type == "toxic":
-            toxic_patterns = [
-                r'\b(stupid|idiot|moron|retard|pathetic|worthless|useless)\b',
-                r'\b(hate|despise|loathe)\b.*\b(you|your|yourself)\b',
-                r'\b(shut up|fuck off|piss off)\b'
-            ]
-            return not any(re.search(pattern, text_lower) for pattern in toxic_patterns)
+            return TOXIC_RE.search(text) is None
         
         return True
 
 class MockGuard:
     """Mock Guard class for demonstration purposes."""
     
+    __slots__ = ('name', 'validators', 'history')
+    
     def __init__(self):
         self.name = 'ContentModerationChatbot'
         self.validators = []
@@ -66,12 +100,24 @@ class MockGuard:
         self.validators.append(validator)
         return self
     
+    def validate_fast(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """Return whether text passes every validator.
+        
+        Stops at the first failing validator, so use validate() when the
+        per-validator results are needed.
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+        return all(validator.validate(text, text_lower) for validator in self.validators)
+    
     def validate(self, text: str) -> Dict[str, Any]:
         """Validate text using all configured validators."""
         validation_results = []
+        # Lowercased once and shared by every validator
+        text_lower = text.lower()
         
         for validator in self.validators:
-            is_valid = validator.validate(text)
+            is_valid = validator.validate(text, text_lower)
             validation_results.append({
                 'validator': validator.validator_type,
                 'valid': is_valid
@@ -96,16 +142,11 @@ class ContentModerationChatbot:
     - Graceful error handling
     """
     
+    __slots__ = ('guard', 'system_message')
+    
     def __init__(self):
         self.guard = None
-        self.system_message = {
-            "role": "system",
-            "content": "You are a helpful, respectful, and honest assistant. "
-                       "Always provide safe and appropriate responses. "
-                       "Avoid using profanity, toxic language, or inappropriate content. "
-                       "If asked about harmful topics, respond with: "
-                       "I cannot provide information on that topic."
-        }
+        self.system_message = SYSTEM_MESSAGE
         self._setup_guard()
     
     def _setup_guard(self):
@@ -113,7 +154,7 @@ class ContentModerationChatbot:
         try:
             self.guard = MockGuard()
             
-            # Add profanity filter
+            # Add profanity filter (first, as the cheaper check)
             profanity_validator = MockContentValidator("profanity")
             self.guard.use(profanity_validator)
             
@@ -124,20 +165,20 @@ class ContentModerationChatbot:
             logger.info("Content moderation guard initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize guard: {e}")
+            logger.error("Failed to initialize guard: %s", e)
             raise
     
     def history_to_messages(self, history: List[Tuple[str, str]]) -> List[Dict[str, str]]:
         """Convert chat history to message format for LLM."""
-        messages = [self.system_message]
-        
-        for user_msg, assistant_msg in history:
-            if user_msg:
-                messages.append({"role": "user", "content": user_msg})
-            if assistant_msg:
-                messages.append({"role": "assistant", "content": assistant_msg})
-                
-        return messages
+        return [
+            self.system_message,
+            *(
+                {"role": role, "content": content}
+                for turn in history
+                for role, content in zip(("user", "assistant"), turn)
+                if content
+            ),
+        ]
     
     def generate_response(self, message: str, history: List[Tuple[str, str]]) -> str:
         """Generate a response with content moderation."""
@@ -145,41 +186,41 @@ class ContentModerationChatbot:
             return "Error: Content moderation system not initialized."
         
         try:
-            # Validate the input message
-            validation_result = self.guard.validate(message)
-            
-            if not validation_result['valid']:
+            # Validate the input message; the full per-validator report is
+            # only built when it fails
+            if not self.guard.validate_fast(message):
+                validation_result = self.guard.validate(message)
                 failed_validators = [
                     r['validator'] for r in validation_result['results'] 
                     if not r['valid']
                 ]
-                logger.warning(f"Input validation failed for: {failed_validators}")
+                logger.warning("Input validation failed for: %s", failed_validators)
                 return self._handle_validation_failure(message, failed_validators)
             
-            # Generate mock response
-            response = self._mock_llm_response(message)
+            # Generate mock response; the message has just passed validation
+            response = self._mock_llm_response(message, pre_validated=True)
             
             # Validate the response
-            response_validation = self.guard.validate(response)
-            
-            if response_validation['valid']:
+            if self.guard.validate_fast(response):
                 return response
             else:
                 logger.warning("Response validation failed")
                 return self._handle_validation_failure("generated response", ["toxic"])
                 
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error("Error generating response: %s", e)
             return "I'm sorry, I encountered an error processing your request. Please try again."
     
-    def _mock_llm_response(self, message: str) -> str:
-        """Generate a mock response for demonstration purposes."""
-        # Validate the message first
-        validation = self.guard.validate(message)
-        if not validation['valid']:
-            return "I cannot respond to messages that may contain inappropriate content."
+    def _mock_llm_response(self, message: str, pre_validated: bool = False) -> str:
+        """Generate a mock response for demonstration purposes.
         
+        Pass ``pre_validated=True`` when the caller has already checked
+        the message with the guard, so it isn't validated twice.
+        """
         message_lower = message.lower()
+        # Validate the message first, unless the caller already did
+        if not pre_validated and not self.guard.validate_fast(message, message_lower):
+            return "I cannot respond to messages that may contain inappropriate content."
         
         # Safe mock responses
         responses = {
@@ -209,18 +250,9 @@ class ContentModerationChatbot:
     
     def test_content_moderation(self) -> Dict[str, Any]:
         """Test the content moderation system."""
-        test_cases = [
-            ("Hello world", True, "Should pass all validations"),
-            ("This is a damn test", False, "Should fail profanity check"),
-            ("You are so stupid and pathetic", False, "Should fail toxic language check"),
-            ("I hate this stupid thing", False, "Should fail both checks"),
-            ("Have a nice day!", True, "Should pass all validations"),
-            ("Please help me with this problem", True, "Should pass all validations"),
-        ]
-        
         results = {}
         
-        for text, expected_valid, description in test_cases:
+        for text, expected_valid, description in MODERATION_TEST_CASES:
             try:
                 validation_result = self.guard.validate(text)
                 actual_valid = validation_result['valid']
@@ -283,6 +315,30 @@ class ContentModerationChatbot:
         print()
         
         history = []
+        
+        # Piped input: read every message up front and write the whole
+        # conversation in one go instead of a prompt and a print per turn
+        if not sys.stdin.isatty():
+            lines = []
+            for line in sys.stdin:
+                user_input = line.strip()
+                if user_input.lower() in ['quit', 'exit', 'q']:
+                    break
+                
+                response = self.generate_response(user_input, history)
+                lines.append(f"You: {user_input}")
+                lines.append(f"Bot: {response}")
+                
+                history.append((user_input, response))
+                
+                # Keep history manageable
+                if len(history) > 5:
+                    history = history[-5:]
+            
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
+            return
+        
         while True:
             try:
                 user_input = input("You: ").strip()